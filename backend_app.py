@@ -1,219 +1,570 @@
-from flask import Flask, request, jsonify
-from flask_cors import CORS
+from quart import Quart, request, jsonify
+from quart_cors import cors
+import os
 import asyncio
+import contextlib
+import functools
+from collections import deque
 import aiohttp
-from bs4 import BeautifulSoup
+from aiolimiter import AsyncLimiter
+from cachetools import TTLCache
+from selectolax.lexbor import LexborHTMLParser
 import re
-import json
+import time
+import orjson
 from urllib.parse import urlparse
 
-app = Flask(__name__)
-CORS(app)
+app = cors(Quart(__name__))
+
+# Username patterns, applied to the URL path.
+_LC_USER = re.compile(r"^(?:u/)?([^/]+)")
+_GFG_USER = re.compile(r"(?:user/|profile/)([^/]+)")
+_CC_USER = re.compile(r"users/([^/]+)")
+_HR_USER = re.compile(r"(?:profile/)?([^/]+)")
+
+_USERNAME_MATCHERS = {
+    'leetcode': _LC_USER.match,
+    'geeksforgeeks': _GFG_USER.search,
+    'codechef': _CC_USER.match,
+    'hackerrank': _HR_USER.search
+}
+
+# Solved-count patterns, matched directly against the raw response bytes.
+_GFG_RE = re.compile(rb'Problem\s*Solved\s*(\d+)')
+_CC_TOTAL_RE = re.compile(rb'Total\s*Problems\s*Solved:\s*(\d+)')
+_CC_ALT_RE = re.compile(rb'Problems\s*Solved[:,]?\s*(\d+)')
+
+# Scope markers: only the matching part of a page (or none of it) is handed to the parser.
+_CC_SECTION_START = re.compile(rb'<section\b[^>]*\bproblems-solved\b')
+_HR_MARKERS = (b'private-profile-page-wrapper', b'badge-card', b'hacker-badge', b'profile-badge')
+
+# Text patterns for the DOM fallbacks.
+_GFG_SOLVED = re.compile(r'Problem\s*Solved\s*(\d+)')
+_DIGITS = re.compile(r'\d+')
+
+# Successful per-(platform, username) results as (value, fetched_at), plus fetches in progress.
+# Entries younger than _FRESH_TTL are served as-is; older ones, up to _STALE_TTL, are served
+# while a background refresh runs.
+_FRESH_TTL = 60
+_STALE_TTL = 900
+_STATS_CACHE = TTLCache(maxsize=10_000, ttl=_STALE_TTL)
+_inflight: dict[tuple, asyncio.Task] = {}
+
+# Token buckets: one for the endpoint as a whole, one per upstream platform.
+_endpoint_limiter = AsyncLimiter(50, 1)
+_UPSTREAM_LIMITERS = {
+    'leetcode': AsyncLimiter(5, 1),
+    'geeksforgeeks': AsyncLimiter(5, 1),
+    'codechef': AsyncLimiter(5, 1),
+    'hackerrank': AsyncLimiter(5, 1)
+}
+
+# Cap on concurrent upstream requests overall; each platform also gets an adaptive AIMD limit.
+_GLOBAL_FETCH_SEM = asyncio.Semaphore(64)
+# Waits longer than this are logged so the limits can be tuned.
+_SEM_WAIT_LOG_THRESHOLD = 0.05
+
+# LeetCode lookups queued within one window are sent as a single aliased GraphQL query.
+_LEETCODE_BATCH_WINDOW = 0.025
+_LEETCODE_BATCH_SIZE = 20
+_leetcode_queue: list[tuple[str, asyncio.Future]] = []
+_leetcode_flusher: asyncio.Task | None = None
+
+# Upstream statuses retried with exponential back-off (0.5s, 1s, 2s, 4s). A retry is only
+# attempted if it can finish, timeout included, within _RETRY_DEADLINE of the first attempt.
+_RETRY_STATUSES = {429, 503}
+_MAX_RETRIES = 4
+_REQUEST_TIMEOUT = 15
+_RETRY_DEADLINE = 30
+
+# Shared HTTP session, created on first use and closed when the server stops.
+# DNS_NAMESERVERS (comma-separated, e.g. "1.1.1.1,8.8.8.8") pins aiodns to specific resolvers.
+_DNS_NAMESERVERS = [ns.strip() for ns in os.environ.get('DNS_NAMESERVERS', '').split(',') if ns.strip()]
+SESSION: aiohttp.ClientSession | None = None
 
 # --- HELPER ---
 
-def extract_username(url, platform):
-    parsed = urlparse(url)
-    path = parsed.path.strip('/')
+class AIMDController:
+    # TCP-style concurrency limit for one upstream platform: grow additively on healthy
+    # responses, halve on 429/5xx, connection errors, or a window of slow responses.
+
+    def __init__(self, initial=8, minimum=1, maximum=32, target_latency=2.0, window=20, alpha=0.5, beta=0.5):
+        self.c = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.alpha = alpha
+        self.beta = beta
+        self._latencies = deque(maxlen=window)
+        self._in_flight = 0
+        self._cond = asyncio.Condition()
+
+    def next_c(self):
+        return max(self.minimum, int(self.c))
+
+    def observe(self, latency, status):
+        self._latencies.append(latency)
+        overloaded = status is None or status == 429 or status >= 500
+        slow = sum(self._latencies) / len(self._latencies) > self.target_latency
+        if overloaded or slow:
+            self.c = max(self.minimum, self.c * self.beta)
+            self._latencies.clear()
+        else:
+            self.c = min(self.maximum, self.c + self.alpha)
+
+    async def __aenter__(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < self.next_c())
+            self._in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # Give the slot back before waiting on the lock, and shield the wake-up, so
+        # cancellation here can neither leak the slot nor strand a waiter.
+        self._in_flight -= 1
+        await asyncio.shield(self._notify_waiters())
+
+    async def _notify_waiters(self):
+        async with self._cond:
+            self._cond.notify_all()
+
+
+_AIMD_CONTROLLERS = {
+    'leetcode': AIMDController(),
+    'geeksforgeeks': AIMDController(),
+    'codechef': AIMDController(),
+    'hackerrank': AIMDController()
+}
+
+
+def get_session():
+    global SESSION
+    if SESSION is None or SESSION.closed:
+        resolver = aiohttp.AsyncResolver(nameservers=_DNS_NAMESERVERS or None)
+        SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                resolver=resolver, use_dns_cache=True, ttl_dns_cache=300,
+                limit=128, limit_per_host=32, keepalive_timeout=60
+            ),
+            timeout=aiohttp.ClientTimeout(total=_REQUEST_TIMEOUT),
+            auto_decompress=True
+        )
+    return SESSION
+
+
+async def close_session():
+    global SESSION
+    if SESSION is not None and not SESSION.closed:
+        await SESSION.close()
+    SESSION = None
+
+
+@contextlib.asynccontextmanager
+async def _fetch_slot(platform, controller):
+    started = time.monotonic()
+    # Platform slot first, so requests queued behind a throttled platform don't hold global slots.
+    async with controller, _GLOBAL_FETCH_SEM:
+        waited = time.monotonic() - started
+        if waited > _SEM_WAIT_LOG_THRESHOLD:
+            app.logger.info("Waited %.3fs for a %s fetch slot (limit %d)", waited, platform, controller.next_c())
+        yield
+
+
+@contextlib.asynccontextmanager
+async def upstream_request(platform, method, url, **kwargs):
+    session = get_session()
+    controller = _AIMD_CONTROLLERS[platform]
+    deadline = time.monotonic() + _RETRY_DEADLINE
+    for attempt in range(_MAX_RETRIES + 1):
+        async with _fetch_slot(platform, controller):
+            async with _UPSTREAM_LIMITERS[platform]:
+                sent = time.monotonic()
+                try:
+                    response = await session.request(method, url, **kwargs)
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    controller.observe(time.monotonic() - sent, None)
+                    raise
+            controller.observe(time.monotonic() - sent, response.status)
+            app.logger.debug("%s %s -> %s (Content-Encoding: %s)", method, url, response.status,
+                             response.headers.get('Content-Encoding'))
+
+            delay = 0.5 * 2 ** attempt
+            retry = (
+                response.status in _RETRY_STATUSES and attempt < _MAX_RETRIES
+                and time.monotonic() + delay + _REQUEST_TIMEOUT <= deadline
+            )
+            if not retry:
+                try:
+                    yield response
+                finally:
+                    response.release()
+                return
+            response.release()
+
+        # Back off without holding fetch slots; the 429/503 has already lowered the host's limit.
+        await asyncio.sleep(delay)
+
+
+def json_response(payload, status=200, headers=None):
+    return app.response_class(orjson.dumps(payload), status=status, headers=headers, mimetype='application/json')
 
-    if platform == 'leetcode':
-        match = re.match(r"^(?:u/)?([^/]+)", path)
-        if match:
-            return match.group(1)
-    elif platform == 'geeksforgeeks':
-        match = re.search(r"(?:user/|profile/)([^/]+)", path)
-        if match:
-            return match.group(1)
-        if path and '/' not in path:
-            return path
-    elif platform == 'codechef':
-        match = re.match(r"users/([^/]+)", path)
-        if match:
-            return match.group(1)
-    elif platform == 'hackerrank':
-        match = re.search(r"(?:profile/)?([^/]+)", path)
-        if match:
-            return match.group(1)
+
+def extract_username(url, platform):
+    path = urlparse(url).path.strip('/')
+
+    matcher = _USERNAME_MATCHERS.get(platform)
+    match = matcher(path) if matcher else None
+    if match:
+        return match.group(1)
+    if platform == 'geeksforgeeks' and path and '/' not in path:
+        return path
     return None
 
-# --- SCRAPER FUNCTIONS ---
 
-async def fetch_leetcode_stats(url):
-    username = extract_username(url, 'leetcode')
-    if not username:
-        return {"solved": "N/A", "url": url, "error": "Invalid LeetCode URL format."}
+async def _fetch_and_store(key, fn, url):
+    result = await fn(url)
+    if "error" not in result:
+        _STATS_CACHE[key] = (result, time.monotonic())
+    return result
+
+
+def _forget_inflight(key, task):
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        task.exception()  # mark as retrieved even if every caller went away
+
+
+def _log_refresh_failure(key, task):
+    if not task.cancelled() and task.exception() is not None:
+        app.logger.warning("Background refresh of %s failed: %s", key, task.exception())
+
+
+def _start_fetch(key, fn, url):
+    task = asyncio.get_running_loop().create_task(_fetch_and_store(key, fn, url))
+    _inflight[key] = task
+    task.add_done_callback(functools.partial(_forget_inflight, key))
+    return task
 
-    graphql_api = "https://leetcode.com/graphql"
+
+# Serve a fetcher's result from the cache (refreshing stale entries in the background)
+# and share one in-flight fetch per profile.
+def cached_stats(platform):
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(url):
+            key = (platform, extract_username(url, platform) or url)
+            task = _inflight.get(key)
+
+            cached = _STATS_CACHE.get(key)
+            if cached is not None:
+                result, fetched_at = cached
+                if time.monotonic() - fetched_at >= _FRESH_TTL and task is None:
+                    _start_fetch(key, fn, url).add_done_callback(functools.partial(_log_refresh_failure, key))
+                return {**result, "url": url}
+
+            if task is None:
+                task = _start_fetch(key, fn, url)
+
+            # Shielded so one caller disconnecting does not cancel the fetch for the others.
+            result = await asyncio.shield(task)
+            return {**result, "url": url}
+        return wrapper
+    return decorator
+
+# --- SCRAPER FUNCTIONS ---
+
+async def fetch_leetcode_batch(usernames):
+    params = ",".join(f"$u{i}:String!" for i in range(len(usernames)))
+    fields = "".join(
+        f"u{i}:matchedUser(username:$u{i}){{submitStatsGlobal{{acSubmissionNum{{difficulty count}}}}}}"
+        for i in range(len(usernames))
+    )
     graphql_query = {
-        "query": """
-        query getUserProfile($username: String!) {
-          matchedUser(username: $username) {
-            submitStats: submitStatsGlobal {
-              acSubmissionNum { difficulty count }
-            }
-          }
-        }""",
-        "variables": {"username": username}
+        "query": f"query({params}){{{fields}}}",
+        "variables": {f"u{i}": username for i, username in enumerate(usernames)}
     }
     headers = {
         "Content-Type": "application/json",
+        "Accept-Encoding": "gzip, br",
         "User-Agent": "Mozilla/5.0"
     }
 
+    async with upstream_request('leetcode', 'POST', "https://leetcode.com/graphql", data=orjson.dumps(graphql_query), headers=headers) as resp:
+        if resp.status != 200:
+            error_text = (await resp.read()).decode('utf-8', errors='replace')
+            error = {"solved": "N/A", "error": f"LeetCode API HTTP {resp.status} - {error_text[:100]}"}
+            return {username: error for username in usernames}
+
+        data = orjson.loads(await resp.read()).get("data") or {}
+
+    results = {}
+    for i, username in enumerate(usernames):
+        user = data.get(f"u{i}")
+        if not user:
+            results[username] = {"solved": "N/A", "error": "LeetCode profile not found or private."}
+            continue
+        stats = user["submitStatsGlobal"]["acSubmissionNum"]
+        solved = next((stat["count"] for stat in stats if stat["difficulty"] == "All"), None)
+        if solved is None:
+            results[username] = {"solved": "N/A", "error": "Solved count for 'All' difficulty not found."}
+        else:
+            results[username] = {"solved": solved}
+    return results
+
+
+async def _resolve_leetcode_batch(batch):
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(graphql_api, json=graphql_query, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as resp:
-                if resp.status != 200:
-                    error_text = await resp.text()
-                    return {"solved": "N/A", "url": url, "error": f"LeetCode API HTTP {resp.status} - {error_text[:100]}"}
-
-                data = await resp.json()
-                if not data.get("data") or not data["data"].get("matchedUser"):
-                    return {"solved": "N/A", "url": url, "error": "LeetCode profile not found or private."}
-
-                stats = data["data"]["matchedUser"]["submitStats"]["acSubmissionNum"]
-                for stat in stats:
-                    if stat["difficulty"] == "All":
-                        return {"solved": stat["count"], "url": url}
-                return {"solved": "N/A", "url": url, "error": "Solved count for 'All' difficulty not found."}
+        results = await fetch_leetcode_batch(list(dict.fromkeys(username for username, _ in batch)))
+    except asyncio.CancelledError:
+        for _, future in batch:
+            future.cancel()
+        raise
     except Exception as e:
-        return {"solved": "N/A", "url": url, "error": f"LeetCode error: {e}"}
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(e)
+        return
 
+    for username, future in batch:
+        if not future.done():
+            future.set_result(results[username])
 
-async def fetch_geeksforgeeks_stats(url):
+
+async def _flush_leetcode_queue():
+    global _leetcode_flusher
+    queued = []
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers={'User-Agent': 'Mozilla/5.0'}) as response:
-                response.raise_for_status()
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-
-                div = soup.find(lambda tag: tag.name == 'div' and 'Problem Solved' in tag.get_text())
-                if div:
-                    match = re.search(r'Problem\s*Solved\s*(\d+)', div.get_text())
-                    if match:
-                        return {"solved": int(match.group(1)), "url": url}
-
-                numbers = re.findall(r'Problem\s*Solved\s*(\d+)', html)
-                if numbers:
-                    return {"solved": int(numbers[0]), "url": url}
-        return {"solved": "N/A", "url": url, "error": "Could not parse solved count."}
-    except Exception as e:
-        return {"solved": "N/A", "url": url, "error": f"GFG error: {e}"}
+        try:
+            await asyncio.sleep(_LEETCODE_BATCH_WINDOW)
+        finally:
+            # Detach the queue even when cancelled, so the next lookup starts a fresh flusher.
+            queued = _leetcode_queue[:]
+            _leetcode_queue.clear()
+            if _leetcode_flusher is asyncio.current_task():
+                _leetcode_flusher = None
+
+        await asyncio.gather(*(
+            _resolve_leetcode_batch(queued[start:start + _LEETCODE_BATCH_SIZE])
+            for start in range(0, len(queued), _LEETCODE_BATCH_SIZE)
+        ))
+    except asyncio.CancelledError:
+        for _, future in queued:
+            future.cancel()
+        raise
+
+
+def _abandon_leetcode_queue(task):
+    global _leetcode_flusher
+    # Only still registered if the flusher was cancelled before its body ever ran.
+    if _leetcode_flusher is task:
+        _leetcode_flusher = None
+        for _, future in _leetcode_queue:
+            future.cancel()
+        _leetcode_queue.clear()
+
+
+def _enqueue_leetcode(username):
+    global _leetcode_flusher
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    _leetcode_queue.append((username, future))
+    if _leetcode_flusher is None:
+        _leetcode_flusher = loop.create_task(_flush_leetcode_queue())
+        _leetcode_flusher.add_done_callback(_abandon_leetcode_queue)
+    return future
+
+
+@cached_stats('leetcode')
+async def fetch_leetcode_stats(url):
+    username = extract_username(url, 'leetcode')
+    if not username:
+        return {"solved": "N/A", "url": url, "error": "Invalid LeetCode URL format."}
 
+    result = await _enqueue_leetcode(username)
+    return {**result, "url": url}
 
-async def fetch_codechef_stats(url):
-    solved_count = "N/A"
-    try:
-        username = extract_username(url, 'codechef')
-        if not username:
-            return {"solved": "N/A", "url": url, "error": "Invalid CodeChef URL."}
-
-        profile_url = f"https://www.codechef.com/users/{username}"
-        headers = {"User-Agent": "Mozilla/5.0"}
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(profile_url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as response:
-                response.raise_for_status()
-                html = await response.text()
-                soup = BeautifulSoup(html, "html.parser")
-
-                section = soup.find("section", class_="rating-data-section problems-solved")
-                if section:
-                    text = section.get_text()
-                    match = re.search(r'Total\s*Problems\s*Solved:\s*(\d+)', text)
-                    if match:
-                        solved_count = int(match.group(1))
-                    else:
-                        numbers = [int(x) for x in re.findall(r'\d+', text)]
-                        if numbers:
-                            solved_count = max(numbers)
-
-                if solved_count == "N/A":
-                    match = re.search(r'Total\s*Problems\s*Solved:\s*(\d+)', html)
-                    if match:
-                        solved_count = int(match.group(1))
-                    else:
-                        match2 = re.search(r'Problems\s*Solved[:,]?\s*(\d+)', html)
-                        if match2:
-                            solved_count = int(match2.group(1))
-
-                if solved_count != "N/A":
-                    return {"solved": solved_count, "url": url}
-        return {"solved": "N/A", "url": url, "error": "Solved problems not found."}
-    except Exception as e:
-        return {"solved": "N/A", "url": url, "error": f"CodeChef error: {e}"}
 
+@cached_stats('geeksforgeeks')
+async def fetch_geeksforgeeks_stats(url):
+    username = extract_username(url, 'geeksforgeeks')
+    if not username:
+        return {"solved": "N/A", "url": url, "error": "Invalid GFG URL."}
+
+    profile_url = f"https://www.geeksforgeeks.org/user/{username}/"
+    headers = {'User-Agent': 'Mozilla/5.0', 'Accept-Encoding': 'gzip, br'}
+
+    async with upstream_request('geeksforgeeks', 'GET', profile_url, headers=headers) as response:
+        response.raise_for_status()
+        body = await response.read()
+
+    match = _GFG_RE.search(body)
+    if match:
+        return {"solved": int(match.group(1)), "url": url}
 
+    # Regex missed (e.g. the count is split across tags); fall back to the DOM.
+    dom = LexborHTMLParser(body.decode('utf-8', errors='replace'))
+    div = next((node for node in dom.css('div') if 'Problem Solved' in node.text()), None)
+    if div:
+        match = _GFG_SOLVED.search(div.text())
+        if match:
+            return {"solved": int(match.group(1)), "url": url}
+    return {"solved": "N/A", "url": url, "error": "Could not parse solved count."}
+
+
+@cached_stats('codechef')
+async def fetch_codechef_stats(url):
+    username = extract_username(url, 'codechef')
+    if not username:
+        return {"solved": "N/A", "url": url, "error": "Invalid CodeChef URL."}
+
+    profile_url = f"https://www.codechef.com/users/{username}"
+    headers = {"User-Agent": "Mozilla/5.0", "Accept-Encoding": "gzip, br"}
+
+    async with upstream_request('codechef', 'GET', profile_url, headers=headers) as response:
+        response.raise_for_status()
+        body = await response.read()
+
+    match = _CC_TOTAL_RE.search(body) or _CC_ALT_RE.search(body)
+    if match:
+        return {"solved": int(match.group(1)), "url": url}
+
+    # Regex missed; fall back to the largest number in the problems-solved section,
+    # parsing only that section rather than the whole page.
+    start = _CC_SECTION_START.search(body)
+    if start:
+        end = body.find(b'</section>', start.start())
+        end = len(body) if end == -1 else end + len(b'</section>')
+        fragment = body[start.start():end].decode('utf-8', errors='replace')
+        section = LexborHTMLParser(fragment).css_first("section.rating-data-section.problems-solved")
+        if section:
+            numbers = [int(x) for x in _DIGITS.findall(section.text())]
+            if numbers:
+                return {"solved": max(numbers), "url": url}
+    return {"solved": "N/A", "url": url, "error": "Solved problems not found."}
+
+
+@cached_stats('hackerrank')
 async def fetch_hackerrank_stats(url):
     username = extract_username(url, 'hackerrank')
     if not username:
         return {"solved": "N/A", "url": url, "error": "Invalid HackerRank URL."}
 
-    headers = {'User-Agent': 'Mozilla/5.0'}
-    
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as response:
-                response.raise_for_status()
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
+    profile_url = f"https://www.hackerrank.com/profile/{username}"
+    headers = {'User-Agent': 'Mozilla/5.0', 'Accept-Encoding': 'gzip, br'}
 
-                if soup.find('div', class_='private-profile-page-wrapper') or 'profile not found' in html.lower():
-                    return {"solved": "N/A", "url": url, "error": "HackerRank profile private or not found."}
+    async with upstream_request('hackerrank', 'GET', profile_url, headers=headers) as response:
+        response.raise_for_status()
+        body = await response.read()
 
-                badge_cards = soup.select('div.badge-card, div.ui-badge-card, div.hacker-badge, div.profile-badge')
-                total_badges_count = len(badge_cards)
+    if b'profile not found' in body.lower():
+        return {"solved": "N/A", "url": url, "error": "HackerRank profile private or not found."}
 
-                return {"solved": total_badges_count, "url": url}
-    except Exception as e:
-        return {"solved": "N/A", "url": url, "error": f"HackerRank error: {e}"}
+    # Only build a DOM when the page mentions one of the classes selected below.
+    if not any(marker in body for marker in _HR_MARKERS):
+        return {"solved": 0, "url": url}
+
+    dom = LexborHTMLParser(body.decode('utf-8', errors='replace'))
+    if dom.css_first('div.private-profile-page-wrapper'):
+        return {"solved": "N/A", "url": url, "error": "HackerRank profile private or not found."}
+
+    badge_cards = dom.css('div.badge-card, div.ui-badge-card, div.hacker-badge, div.profile-badge')
+    return {"solved": len(badge_cards), "url": url}
 
 
 # --- ENDPOINT ---
 
+FETCHERS = {
+    'leetcode': fetch_leetcode_stats,
+    'geeksforgeeks': fetch_geeksforgeeks_stats,
+    'codechef': fetch_codechef_stats,
+    'hackerrank': fetch_hackerrank_stats
+}
+
+
+def error_result(url, exc):
+    return {"solved": "N/A", "url": url, "error": str(exc) or type(exc).__name__}
+
+
+async def _tagged(platform, url, coro):
+    try:
+        return platform, await coro
+    except Exception as e:
+        return platform, error_result(url, e)
+
+
+# Yields one NDJSON line per platform as soon as its fetch finishes, then the total.
+async def stream_stats(urls):
+    pending = []
+    for platform, fn in FETCHERS.items():
+        if urls[platform]:
+            pending.append(_tagged(platform, urls[platform], fn(urls[platform])))
+        else:
+            yield orjson.dumps({"platform": platform, "stats": {"solved": "N/A", "url": ""}}) + b'\n'
+
+    total_solved = 0
+    for next_done in asyncio.as_completed(pending):
+        platform, result = await next_done
+        if platform != "hackerrank" and isinstance(result.get("solved"), int):
+            total_solved += result["solved"]
+        yield orjson.dumps({"platform": platform, "stats": result}) + b'\n'
+
+    yield orjson.dumps({"totalSolved": total_solved}) + b'\n'
+
+
 @app.route('/api/get_stats', methods=['POST'])
 async def get_stats():
-    data = request.get_json()
+    if not _endpoint_limiter.has_capacity():
+        return json_response({"error": "Too many requests, please retry shortly."}, 429, {"Retry-After": "1"})
+    await _endpoint_limiter.acquire()
+
+    data = await request.get_json()
     if not data:
-        return jsonify({"error": "No data provided"}), 400
+        return json_response({"error": "No data provided"}, 400)
 
-    urls = {
-        'leetcode': data.get('leetcode'),
-        'geeksforgeeks': data.get('geeksforgeeks'),
-        'codechef': data.get('codechef'),
-        'hackerrank': data.get('hackerrank')
-    }
-    fetchers = {
-        'leetcode': fetch_leetcode_stats,
-        'geeksforgeeks': fetch_geeksforgeeks_stats,
-        'codechef': fetch_codechef_stats,
-        'hackerrank': fetch_hackerrank_stats
-    }
+    urls = {platform: data.get(platform) for platform in FETCHERS}
 
-    tasks, platforms = [], []
-    for platform, fn in fetchers.items():
-        if urls[platform]:
-            tasks.append(fn(urls[platform]))
-            platforms.append(platform)
+    # Clients that accept NDJSON get each platform's card as soon as it is ready.
+    if request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson']) == 'application/x-ndjson':
+        return app.response_class(stream_stats(urls), mimetype='application/x-ndjson')
 
-    results = await asyncio.gather(*tasks)
+    tasks = [fn(urls[platform]) for platform, fn in FETCHERS.items() if urls[platform]]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
 
-    platform_stats = {platforms[i]: results[i] for i in range(len(results))}
-    for k in fetchers.keys():
-        if k not in platform_stats:
-            platform_stats[k] = {"solved": "N/A", "url": ""}
+    platform_stats = {}
+    total_solved = 0
+    idx = 0
+    for platform in FETCHERS:
+        if urls[platform]:
+            result = results[idx]
+            idx += 1
+            if isinstance(result, BaseException):
+                platform_stats[platform] = error_result(urls[platform], result)
+                continue
+            platform_stats[platform] = result
+            if platform != "hackerrank":
+                solved = result.get("solved")
+                if isinstance(solved, int):
+                    total_solved += solved
+        else:
+            platform_stats[platform] = {"solved": "N/A", "url": ""}
+
+    return json_response({"platforms": platform_stats, "totalSolved": total_solved})
 
-    total_solved = sum(
-        int(data["solved"]) for k, data in platform_stats.items()
-        if k != "hackerrank" and isinstance(data.get("solved"), int)
-    )
 
-    return jsonify({"platforms": platform_stats, "totalSolved": total_solved})
 
+@app.after_serving
+async def shutdown():
+    await close_session()
 
 
 # --- HEALTH CHECK ROUTE FOR UPTIMEROBOT ---
 @app.route('/')
 def home():
     return jsonify({"status": "Backend is running"}), 200
+
+
+if __name__ == '__main__':
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    app.run()